@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import auth
+from app.api.endpoints import auth, profiling
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(profiling.router, prefix="/admin/profiles", tags=["profiling"])
 
 # aqui se agregarán las demas rutas conforme el proyecto cresca
 # un pequeno ejemplo:
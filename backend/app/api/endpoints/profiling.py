@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse, Response
+from typing import Any
+
+from app.core.deps import get_current_admin_user
+from app.core.profiling import ProfileReport, profile_store
+from app.models.user import User
+from app.schemas.profiling import ProfileSummary
+
+router = APIRouter()
+
+def _get_report_or_404(profile_id: str) -> ProfileReport:
+    report = profile_store.get(profile_id)
+    if report is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reporte de perfilado no encontrado"
+        )
+    return report
+
+@router.get("/", response_model=list[ProfileSummary])
+async def list_profiles(current_user: User = Depends(get_current_admin_user)) -> Any:
+    """
+    Lista los reportes de perfilado almacenados, del mas reciente al mas antiguo (solo administradores)
+    """
+    return [report.to_dict() for report in profile_store.list()]
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+async def read_profile(
+    profile_id: str,
+    current_user: User = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Obtiene el arbol de llamadas de un reporte de perfilado en texto (solo administradores)
+    """
+    return _get_report_or_404(profile_id).to_text()
+
+@router.get("/{profile_id}/speedscope")
+async def read_profile_speedscope(
+    profile_id: str,
+    current_user: User = Depends(get_current_admin_user)
+) -> Any:
+    """
+    Obtiene un reporte de perfilado en formato speedscope para verlo como flamegraph (solo administradores)
+    """
+    report = _get_report_or_404(profile_id)
+    return Response(content=report.to_speedscope(), media_type="application/json")
+
+@router.delete("/", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_profiles(current_user: User = Depends(get_current_admin_user)) -> None:
+    """
+    Elimina todos los reportes de perfilado almacenados (solo administradores)
+    """
+    profile_store.clear()
@@ -1,6 +1,7 @@
 import os
+from pydantic import Field
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 
 class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
@@ -19,6 +20,15 @@ class Settings(BaseSettings):
     # las credenciales deSupabase
     SUPABASE_URL: str = os.getenv("SUPABASE_URL")
     SUPABASE_KEY: str = os.getenv("API_KEY")
+
+    # Perfilado bajo demanda (desactivado por defecto, sin costo si esta apagado)
+    PROFILING_ENABLED: bool = False
+    PROFILING_HEADER: str = "X-Profile"
+    # valor secreto que debe traer la cabecera; sin el, no se perfila por cabecera
+    PROFILING_TOKEN: Optional[str] = None
+    PROFILING_SAMPLE_RATE: float = Field(0.0, ge=0.0, le=1.0)
+    PROFILING_BUFFER_SIZE: int = Field(50, ge=1)
+    PROFILING_INTERVAL: float = Field(0.001, gt=0.0)
     
     class Config:
         case_sensitive = True
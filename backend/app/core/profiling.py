@@ -0,0 +1,196 @@
+import hmac
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional
+
+from fastapi import HTTPException, Request
+from pyinstrument import Profiler
+from pyinstrument.renderers import ConsoleRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+
+from app.core.config import settings
+from app.core.deps import get_current_active_user, get_current_admin_user, get_current_user
+
+
+class ProfileReport:
+    """
+    este es el reporte de perfilado de una peticion, con la sesion de pyinstrument.
+    """
+    def __init__(
+        self,
+        method: str,
+        path: str,
+        status_code: int,
+        duration_ms: float,
+        reason: str,
+        session: Session
+    ):
+        self.id = str(uuid.uuid4())
+        self.created_at = datetime.utcnow()
+        self.method = method
+        self.path = path
+        self.status_code = status_code
+        self.duration_ms = duration_ms
+        self.reason = reason
+        self.session = session
+
+    def to_text(self) -> str:
+        """
+        aqui se renderiza el arbol de llamadas como texto.
+
+        Returns:
+            str: Reporte en texto plano
+        """
+        return ConsoleRenderer(unicode=False, color=False).render(self.session)
+
+    def to_speedscope(self) -> str:
+        """
+        aqui se renderiza el reporte en formato speedscope (flamegraph).
+
+        Returns:
+            str: Reporte en JSON de speedscope
+        """
+        return SpeedscopeRenderer().render(self.session)
+
+    def to_dict(self) -> dict:
+        """
+        aqui se convierte el reporte a un diccionario sin la sesion de perfilado.
+
+        Returns:
+            dict: Diccionario con el resumen del reporte
+        """
+        return {
+            "id": self.id,
+            "created_at": self.created_at.isoformat(),
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": self.duration_ms,
+            "reason": self.reason
+        }
+
+
+class ProfileStore:
+    """
+    buffer circular acotado con los ultimos reportes de perfilado.
+    """
+    def __init__(self, maxlen: int):
+        self._reports: Deque[ProfileReport] = deque(maxlen=maxlen)
+        self._lock = threading.Lock()
+
+    def add(self, report: ProfileReport) -> None:
+        with self._lock:
+            self._reports.append(report)
+
+    def list(self) -> List[ProfileReport]:
+        with self._lock:
+            return list(reversed(self._reports))
+
+    def get(self, report_id: str) -> Optional[ProfileReport]:
+        with self._lock:
+            for report in self._reports:
+                if report.id == report_id:
+                    return report
+        return None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._reports.clear()
+
+
+# Almacen global de reportes
+profile_store = ProfileStore(maxlen=settings.PROFILING_BUFFER_SIZE)
+
+# para acotar el costo en produccion se perfila una sola peticion a la vez
+_profiler_lock = threading.Lock()
+
+
+def _has_profiling_token(request: Request) -> bool:
+    """
+    aqui se compara el valor de la cabecera de perfilado con PROFILING_TOKEN,
+    sin llamar a Supabase. Se comparan bytes porque Starlette decodifica las
+    cabeceras como latin-1 y compare_digest no acepta str con caracteres no ASCII.
+    """
+    value = request.headers.get(settings.PROFILING_HEADER)
+    if not value or not settings.PROFILING_TOKEN:
+        return False
+    return hmac.compare_digest(value.encode("latin-1"), settings.PROFILING_TOKEN.encode("utf-8"))
+
+
+async def _is_admin_request(request: Request) -> bool:
+    """
+    aqui se verifica que la peticion venga de un administrador con token valido.
+    """
+    authorization = request.headers.get("Authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        user = await get_current_user(token)
+        user = await get_current_active_user(user)
+        await get_current_admin_user(user)
+    except HTTPException:
+        return False
+    return True
+
+
+async def _profiling_reason(request: Request) -> Optional[str]:
+    """
+    aqui se decide si la peticion se debe perfilar y por que motivo.
+    La cabecera solo se toma en cuenta si trae PROFILING_TOKEN, para que un
+    cliente anonimo no pueda forzar consultas extra a Supabase.
+
+    Returns:
+        Optional[str]: "header", "sampling" o None si no se perfila
+    """
+    if _has_profiling_token(request) and await _is_admin_request(request):
+        return "header"
+    if settings.PROFILING_SAMPLE_RATE > 0 and random.random() < settings.PROFILING_SAMPLE_RATE:
+        return "sampling"
+    return None
+
+
+async def profiling_middleware(request: Request, call_next):
+    """
+    middleware que perfila con pyinstrument las peticiones de administradores
+    que envian la cabecera de perfilado, o una muestra aleatoria de peticiones.
+    El modo asincrono de pyinstrument solo atribuye el tiempo del contexto de
+    esta peticion; el tiempo en otras tareas del loop aparece como [await].
+    Solo se registra si PROFILING_ENABLED esta activo.
+    """
+    reason = await _profiling_reason(request)
+    if reason is None:
+        return await call_next(request)
+    if not _profiler_lock.acquire(blocking=False):
+        response = await call_next(request)
+        if reason == "header":
+            response.headers["X-Profile-Skipped"] = "busy"
+        return response
+
+    profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+    start = time.perf_counter()
+    try:
+        profiler.start()
+        try:
+            response = await call_next(request)
+        finally:
+            session = profiler.stop()
+    finally:
+        _profiler_lock.release()
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    report = ProfileReport(
+        method=request.method,
+        path=request.url.path,
+        status_code=response.status_code,
+        duration_ms=round(duration_ms, 3),
+        reason=reason,
+        session=session
+    )
+    profile_store.add(report)
+    response.headers["X-Profile-Id"] = report.id
+    return response
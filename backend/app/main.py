@@ -3,6 +3,7 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
 from app.api.api import api_router
+from app.core.profiling import profiling_middleware
 
 app = FastAPI(
     title="Onboarding de Créditos para PYMES",
@@ -19,6 +20,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Perfilado bajo demanda: solo se registra si esta activo para no agregar costo
+if settings.PROFILING_ENABLED:
+    app.middleware("http")(profiling_middleware)
+
 @app.get("/")
 async def root():
     return {"message": "Bienvenido a la API de Onboarding de Créditos para PYMES"}
@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+class ProfileSummary(BaseModel):
+    """esquema para el resumen de un reporte de perfilado"""
+    id: str
+    created_at: datetime
+    method: str
+    path: str
+    status_code: int
+    duration_ms: float
+    reason: str
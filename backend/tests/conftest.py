@@ -0,0 +1,5 @@
+import os
+
+# credenciales ficticias para que el cliente de Supabase se pueda crear al importar la app
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("API_KEY", "test-key")
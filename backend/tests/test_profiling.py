@@ -0,0 +1,267 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI, HTTPException, status
+from pyinstrument import Profiler
+from starlette.requests import Request
+
+from app.api.endpoints import profiling as profiling_endpoints
+from app.core import profiling
+from app.core.config import settings
+from app.core.deps import get_current_admin_user
+from app.core.profiling import ProfileReport, ProfileStore, _profiling_reason
+from app.models.user import User, UserRole
+
+
+def make_report(path: str = "/") -> ProfileReport:
+    profiler = Profiler(async_mode="disabled")
+    profiler.start()
+    session = profiler.stop()
+    return ProfileReport(
+        method="GET",
+        path=path,
+        status_code=200,
+        duration_ms=1.0,
+        reason="sampling",
+        session=session
+    )
+
+
+def make_request(headers: dict) -> Request:
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    })
+
+
+@pytest.fixture
+def profiling_settings(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILING_TOKEN", "secreto")
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 0.0)
+
+
+def patch_current_user(monkeypatch, role: UserRole = None):
+    calls = []
+
+    async def fake_get_current_user(token):
+        calls.append(token)
+        if role is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+        return User(id="1", email="a@b.com", full_name="Admin", role=role)
+
+    monkeypatch.setattr(profiling, "get_current_user", fake_get_current_user)
+    return calls
+
+
+def test_store_is_bounded_and_newest_first():
+    store = ProfileStore(maxlen=2)
+    reports = [make_report(f"/{i}") for i in range(3)]
+    for report in reports:
+        store.add(report)
+
+    assert [r.path for r in store.list()] == ["/2", "/1"]
+    assert store.get(reports[0].id) is None
+    assert store.get(reports[2].id) is reports[2]
+
+
+def test_store_clear():
+    store = ProfileStore(maxlen=2)
+    report = make_report()
+    store.add(report)
+    store.clear()
+
+    assert store.list() == []
+    assert store.get(report.id) is None
+
+
+def test_report_renders_text_and_speedscope():
+    report = make_report()
+
+    assert isinstance(report.to_text(), str)
+    assert '"$schema"' in report.to_speedscope()
+    assert "session" not in report.to_dict()
+
+
+def test_reason_header_from_admin(monkeypatch, profiling_settings):
+    patch_current_user(monkeypatch, UserRole.ADMIN)
+    request = make_request({"X-Profile": "secreto", "Authorization": "Bearer x"})
+
+    assert asyncio.run(_profiling_reason(request)) == "header"
+
+
+def test_reason_header_without_admin(monkeypatch, profiling_settings):
+    patch_current_user(monkeypatch, UserRole.CLIENT)
+    request = make_request({"X-Profile": "secreto", "Authorization": "Bearer x"})
+
+    assert asyncio.run(_profiling_reason(request)) is None
+
+
+def test_reason_header_with_invalid_token(monkeypatch, profiling_settings):
+    patch_current_user(monkeypatch)
+    request = make_request({"X-Profile": "secreto", "Authorization": "Bearer x"})
+
+    assert asyncio.run(_profiling_reason(request)) is None
+
+
+def test_reason_wrong_header_value_skips_supabase(monkeypatch, profiling_settings):
+    calls = patch_current_user(monkeypatch, UserRole.ADMIN)
+    request = make_request({"X-Profile": "otro", "Authorization": "Bearer x"})
+
+    assert asyncio.run(_profiling_reason(request)) is None
+    assert calls == []
+
+
+def test_reason_non_ascii_header_value(monkeypatch, profiling_settings):
+    calls = patch_current_user(monkeypatch, UserRole.ADMIN)
+    request = Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"x-profile", "\xe9".encode("latin-1")), (b"authorization", b"Bearer x")],
+    })
+
+    assert asyncio.run(_profiling_reason(request)) is None
+    assert calls == []
+
+
+def test_reason_sampling(monkeypatch, profiling_settings):
+    calls = patch_current_user(monkeypatch, UserRole.ADMIN)
+    request = make_request({})
+
+    assert asyncio.run(_profiling_reason(request)) is None
+
+    monkeypatch.setattr(settings, "PROFILING_SAMPLE_RATE", 1.0)
+    assert asyncio.run(_profiling_reason(request)) == "sampling"
+    assert calls == []
+
+
+def test_buffer_size_must_be_positive():
+    with pytest.raises(ValueError):
+        type(settings)(PROFILING_BUFFER_SIZE=0)
+
+
+async def call_app(app, method: str, url: str, headers: dict = None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, url, headers=headers)
+
+
+@pytest.fixture
+def admin_app(monkeypatch):
+    async def fake_admin():
+        return User(id="1", email="a@b.com", full_name="Admin", role=UserRole.ADMIN)
+
+    store = ProfileStore(maxlen=5)
+    monkeypatch.setattr(profiling_endpoints, "profile_store", store)
+    app = FastAPI()
+    app.include_router(profiling_endpoints.router, prefix="/profiles")
+    yield app, store, fake_admin
+
+
+def test_endpoints_require_admin(admin_app):
+    app, _, _ = admin_app
+
+    response = asyncio.run(call_app(app, "GET", "/profiles/"))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_endpoints_list_read_and_clear(admin_app):
+    app, store, fake_admin = admin_app
+    app.dependency_overrides[get_current_admin_user] = fake_admin
+    report = make_report("/api/v1/auth/admin/users")
+    store.add(report)
+
+    response = asyncio.run(call_app(app, "GET", "/profiles/"))
+    assert response.status_code == 200
+    assert [r["id"] for r in response.json()] == [report.id]
+
+    response = asyncio.run(call_app(app, "GET", f"/profiles/{report.id}"))
+    assert response.status_code == 200
+
+    response = asyncio.run(call_app(app, "GET", f"/profiles/{report.id}/speedscope"))
+    assert response.json()["$schema"]
+
+    response = asyncio.run(call_app(app, "GET", "/profiles/desconocido"))
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = asyncio.run(call_app(app, "DELETE", "/profiles/"))
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert store.list() == []
+
+
+def busy_work_of_other_request():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+
+
+def busy_work_of_profiled_request():
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+
+
+@pytest.fixture
+def profiled_app(monkeypatch, profiling_settings):
+    store = ProfileStore(maxlen=5)
+    monkeypatch.setattr(profiling, "profile_store", store)
+    patch_current_user(monkeypatch, UserRole.ADMIN)
+    app = FastAPI()
+    app.middleware("http")(profiling.profiling_middleware)
+
+    @app.get("/lento")
+    async def slow():
+        busy_work_of_profiled_request()
+        await asyncio.sleep(0.1)
+        return {}
+
+    @app.get("/ocupado")
+    async def busy():
+        busy_work_of_other_request()
+        return {}
+
+    return app, store
+
+
+def test_middleware_isolates_concurrent_requests(profiled_app):
+    app, store = profiled_app
+    headers = {"X-Profile": "secreto", "Authorization": "Bearer x"}
+
+    async def run():
+        profiled = asyncio.create_task(call_app(app, "GET", "/lento", headers))
+        await asyncio.sleep(0.07)
+        await call_app(app, "GET", "/ocupado")
+        return await profiled
+
+    response = asyncio.run(run())
+    report = store.get(response.headers["X-Profile-Id"])
+
+    assert report is not None
+    assert "busy_work_of_profiled_request" in report.to_text()
+    assert "busy_work_of_other_request" not in report.to_text()
+
+
+def test_middleware_marks_skipped_when_busy(profiled_app, monkeypatch):
+    app, store = profiled_app
+    headers = {"X-Profile": "secreto", "Authorization": "Bearer x"}
+    profiling._profiler_lock.acquire()
+    try:
+        response = asyncio.run(call_app(app, "GET", "/lento", headers))
+    finally:
+        profiling._profiler_lock.release()
+
+    assert response.headers["X-Profile-Skipped"] == "busy"
+    assert "X-Profile-Id" not in response.headers
+    assert store.list() == []
+
+
+def test_middleware_not_registered_when_disabled():
+    from app.main import app
+
+    assert settings.PROFILING_ENABLED is False
+    dispatchers = [m.options.get("dispatch") for m in app.user_middleware]
+    assert profiling.profiling_middleware not in dispatchers